@@ -25,6 +25,9 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = config('SECRET_KEY', default='django-insecure-dev-key-change-in-production')
 
+# Key used to HMAC one-time poll tokens before storage (defaults to SECRET_KEY)
+TOKEN_PEPPER = config('TOKEN_PEPPER', default=SECRET_KEY)
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = config('DEBUG', default=False, cast=bool)
 
@@ -93,7 +96,7 @@ if DATABASE_URL:
     DATABASES = {
         'default': dj_database_url.config(
             default=DATABASE_URL,
-            conn_max_age=600,
+            conn_max_age=config('CONN_MAX_AGE', default=600, cast=int),
             conn_health_checks=True,
         )
     }
@@ -21,5 +21,4 @@ class VotingConfig(AppConfig):
         Used to register signals and other startup tasks.
         """
         # Import signals here to register them
-        # import voting.signals  # Uncomment if you create signals
-        pass
+        import voting.signals  # noqa: F401
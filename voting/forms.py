@@ -241,7 +241,7 @@ class VoteForm(forms.Form):
         Initialize form with poll's candidates.
         
         Args:
-            candidates: QuerySet of Candidate objects for this poll
+            candidates: List (or QuerySet) of Candidate objects for this poll
         """
         super().__init__(*args, **kwargs)
         self.candidates = candidates
@@ -293,3 +293,17 @@ class VoteForm(forms.Form):
                                  f'{len(self.candidates)}.')
         
         return cleaned_data
+
+    def get_ranking(self):
+        """
+        Build the ranked list of candidate IDs from validated form data.
+        
+        Returns:
+            List of candidate ID strings ordered from 1st to last choice
+        """
+        positions = [
+            (int(self.cleaned_data[f'rank_{c.id}']), str(c.id))
+            for c in self.candidates
+        ]
+        positions.sort()
+        return [cid for _, cid in positions]
@@ -0,0 +1,42 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voting", "0010_alter_poll_tiebreaker_method"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="poll",
+            name="cached_winner_id",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Winner candidate UUID, recomputed whenever a vote is cast or modified",
+                max_length=36,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="poll",
+            name="cached_winner_method",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Method that decided cached_winner_id (condorcet, schulze, borda, random)",
+                max_length=20,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="poll",
+            name="cached_vote_count",
+            field=models.IntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of votes the cached winner was computed from",
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voting", "0011_poll_cached_winner"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="poll",
+            name="cached_winner_random",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text="Whether cached_winner_id was chosen by the random tiebreaker",
+            ),
+        ),
+        migrations.AddField(
+            model_name="poll",
+            name="cached_stats",
+            field=models.JSONField(
+                blank=True,
+                editable=False,
+                help_text="First-choice counts and pairwise results for the results page",
+                null=True,
+            ),
+        ),
+    ]
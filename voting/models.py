@@ -15,13 +15,22 @@ Security:
 - Voter anonymity maintained (no personal data stored)
 """
 
-from django.db import models # pyright: ignore[reportMissingModuleSource]
+from django.db import connection, models # pyright: ignore[reportMissingModuleSource]
 from django.core.validators import MinValueValidator, MaxLengthValidator # pyright: ignore[reportMissingModuleSource]
 from django.utils import timezone # pyright: ignore[reportMissingModuleSource]
+from django.conf import settings # pyright: ignore[reportMissingModuleSource]
+import hmac
+from collections import Counter
+import logging
+import orjson
 import uuid
 import string
 import random
 
+from .utils import calculate_condorcet_winner, get_ranking_statistics
+
+logger = logging.getLogger(__name__)
+
 
 def generate_token():
     """Generate unique hex token for cookies."""
@@ -42,6 +51,9 @@ class Poll(models.Model):
         updated_at: Timestamp of last update
         is_active: Whether poll is open for voting
         max_votes: Optional limit on number of votes (None = unlimited)
+        cached_winner_id / cached_winner_method / cached_winner_random /
+        cached_stats / cached_vote_count:
+            Winner and statistics precomputed at vote time (see refresh_cached_winner)
     """
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -121,6 +133,41 @@ class Poll(models.Model):
         default=False,
         help_text="Whether voters can modify their vote using a private management link"
     )
+
+    cached_winner_id = models.CharField(
+        max_length=36,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Winner candidate UUID, recomputed whenever a vote is cast or modified"
+    )
+
+    cached_winner_method = models.CharField(
+        max_length=20,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Method that decided cached_winner_id (condorcet, schulze, borda, random)"
+    )
+
+    cached_winner_random = models.BooleanField(
+        default=False,
+        editable=False,
+        help_text="Whether cached_winner_id was chosen by the random tiebreaker"
+    )
+
+    cached_stats = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="First-choice counts and pairwise results for the results page"
+    )
+
+    cached_vote_count = models.IntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of votes the cached winner was computed from"
+    )
     
     class Meta:
         ordering = ['-created_at']
@@ -150,6 +197,100 @@ class Poll(models.Model):
         """Return all candidates for this poll."""
         return self.candidate_set.all().order_by('name')
 
+    def refresh_cached_winner(self):
+        """
+        Recompute the winner and statistics from all votes and store them on the poll.
+        
+        Called (via the Vote post_save/post_delete signals) after a vote is
+        recorded, modified or deleted, so read views can use the cached_*
+        fields without recalculating. The result is only stored if the poll
+        still has the number of votes it was computed from; otherwise the
+        refresh triggered by the newer change stores its own result.
+        """
+        # Stream the rankings once into distinct ballots, so memory grows with
+        # the number of distinct rankings rather than the number of votes
+        ballots = Counter(tuple(ranking) for ranking in self._iter_rankings())
+        vote_count = sum(ballots.values())
+        winner_id = None
+        winner_method = None
+        winner_random = False
+        stats = {}
+        
+        if ballots:
+            valid_candidate_ids = {str(pk) for pk in self.candidate_set.values_list('id', flat=True)}
+            try:
+                winner_id, winner_method, winner_random = calculate_condorcet_winner(
+                    ballots, self.tiebreaker_method, expected_candidates=valid_candidate_ids
+                )
+                stats = get_ranking_statistics(ballots)
+                # JSON object keys must be strings, so store pairs as [a, b, votes]
+                stats['pairwise_results'] = [
+                    [cand_a, cand_b, votes]
+                    for (cand_a, cand_b), votes in stats['pairwise_results'].items()
+                ]
+            except Exception as e:
+                # Store a failure marker so results_poll can report the error
+                logger.error(f"Error calculating winner for poll {self.id}: {str(e)}")
+                winner_id, winner_method, winner_random = None, None, False
+                stats = {'error': True}
+        
+        if self.vote_set.count() != vote_count:
+            return
+        
+        now = timezone.now()
+        Poll.objects.filter(pk=self.pk).update(
+            cached_winner_id=winner_id,
+            cached_winner_method=winner_method,
+            cached_winner_random=winner_random,
+            cached_stats=stats,
+            cached_vote_count=vote_count,
+            updated_at=now,
+        )
+        # Callers such as poll_api_results build their ETag from updated_at
+        self.updated_at = now
+        self.cached_winner_id = winner_id
+        self.cached_winner_method = winner_method
+        self.cached_winner_random = winner_random
+        self.cached_stats = stats
+        self.cached_vote_count = vote_count
+
+    def ensure_cached_results(self, vote_count=None, has_cached_stats=None):
+        """
+        Recompute the cached results if they were never stored or don't cover the current votes.
+        
+        Read views call this before using the cached_* fields, so a refresh
+        that failed after commit (on_commit runs with robust=True) is caught up
+        on the next read. Callers that already annotated the live vote count or
+        whether cached_stats is set can pass them to avoid extra queries.
+        """
+        if vote_count is None:
+            vote_count = self.get_vote_count()
+        if has_cached_stats is None:
+            has_cached_stats = self.cached_stats is not None
+        if not has_cached_stats or self.cached_vote_count != vote_count:
+            self.refresh_cached_winner()
+
+    def _iter_rankings(self, chunk_size=2000):
+        """
+        Stream the rankings of all votes on this poll.
+        
+        Runs the ORM-built query on the same chunked (server-side where
+        supported) cursor that QuerySet.iterator() uses, and parses the JSON
+        with orjson, skipping JSONField's per-row json.loads converter.
+        """
+        sql, params = self.vote_set.order_by().values_list('ranking').query.sql_with_params()
+        # Like iterator(), honour DISABLE_SERVER_SIDE_CURSORS (e.g. behind PgBouncer)
+        if connection.settings_dict.get('DISABLE_SERVER_SIDE_CURSORS'):
+            cursor = connection.cursor()
+        else:
+            cursor = connection.chunked_cursor()
+        with cursor:
+            cursor.execute(sql, params)
+            while rows := cursor.fetchmany(chunk_size):
+                for (ranking,) in rows:
+                    # Some database drivers hand back already-decoded JSON
+                    yield orjson.loads(ranking) if isinstance(ranking, (str, bytes)) else ranking
+
     def can_accept_votes(self):
         """Check if poll can accept new votes."""
         if not self.is_active:
@@ -183,6 +324,21 @@ class PollToken(models.Model):
     def __str__(self):
         return f"Token for {self.poll.id} ({'Used' if self.is_used else 'Active'})"
 
+    @staticmethod
+    def hash_token(token):
+        """
+        Hash a one-time token for storage and lookup.
+        Tokens are 120-bit random strings, so a keyed HMAC-SHA256 is enough
+        (a slow password hasher only matters for low-entropy passwords).
+        
+        Args:
+            token: Plaintext token given to the voter
+            
+        Returns:
+            HMAC-SHA256 hex digest
+        """
+        return hmac.new(settings.TOKEN_PEPPER.encode(), token.encode(), hashlib.sha256).hexdigest()
+
 
 
 class Candidate(models.Model):
@@ -0,0 +1,81 @@
+"""
+Signal handlers for the voting app
+==================================
+
+Keeps the precomputed results stored on Poll (and the cached candidate list
+used by poll_api_results) in sync with its votes and candidates.
+"""
+
+from django.core.cache import cache # pyright: ignore[reportMissingModuleSource]
+from django.db import transaction # pyright: ignore[reportMissingModuleSource]
+from django.db.models.signals import post_delete, post_save # pyright: ignore[reportMissingModuleSource]
+from django.dispatch import receiver # pyright: ignore[reportMissingModuleSource]
+
+from .models import Poll, Candidate, Vote
+
+
+def _deleted_with_poll(origin):
+    """Whether a post_delete was caused by deleting the poll itself (CASCADE)."""
+    return isinstance(origin, Poll) or getattr(origin, 'model', None) is Poll
+
+
+def _refresh_poll(poll_id, clear_candidates):
+    if clear_candidates:
+        # Key set by poll_api_results
+        cache.delete(f"cands:{poll_id}")
+    poll = Poll.objects.filter(pk=poll_id).first()
+    if poll is not None:
+        poll.refresh_cached_winner()
+
+
+def _schedule_refresh(poll_id, clear_candidates=False):
+    """
+    Refresh a poll's cached results once the current transaction commits.
+
+    A bulk delete sends one signal per row, so a refresh still pending for the
+    same poll on this connection is reused instead of queuing another. It is
+    looked up among the connection's on_commit callbacks, which Django drops on
+    rollback, so a rolled-back change never suppresses a later refresh.
+    """
+    connection = transaction.get_connection()
+    for _savepoint_ids, func, _robust in connection.run_on_commit:
+        pending = getattr(func, 'pending_refresh', None)
+        if pending is not None and pending['poll_id'] == poll_id and not pending['done']:
+            pending['clear_candidates'] = pending['clear_candidates'] or clear_candidates
+            return
+
+    pending = {'poll_id': poll_id, 'clear_candidates': clear_candidates, 'done': False}
+
+    def refresh():
+        pending['done'] = True
+        _refresh_poll(poll_id, pending['clear_candidates'])
+
+    refresh.pending_refresh = pending
+    transaction.on_commit(refresh, robust=True)
+
+
+@receiver(post_save, sender=Vote)
+@receiver(post_delete, sender=Vote)
+def refresh_poll_results(sender, instance, origin=None, **kwargs):
+    """Recompute the poll's cached winner and statistics once the vote change is committed."""
+    if _deleted_with_poll(origin):
+        return
+    _schedule_refresh(instance.poll_id)
+
+
+@receiver(post_save, sender=Candidate)
+@receiver(post_delete, sender=Candidate)
+def refresh_poll_candidates(sender, instance, origin=None, **kwargs):
+    """Drop the poll's cached candidate list and recompute its results once the change is committed."""
+    if _deleted_with_poll(origin):
+        return
+    _schedule_refresh(instance.poll_id, clear_candidates=True)
+
+
+@receiver(post_save, sender=Poll)
+def refresh_poll_tiebreaker(sender, instance, created, update_fields=None, **kwargs):
+    """Recompute the cached winner once a change of tiebreaker method is committed."""
+    if created:
+        return
+    if update_fields is None or 'tiebreaker_method' in update_fields:
+        _schedule_refresh(instance.pk)
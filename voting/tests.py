@@ -0,0 +1,312 @@
+"""
+Tests for the voting app
+========================
+
+Run with: python manage.py test voting
+"""
+
+import uuid
+from unittest import mock
+
+import factory # pyright: ignore[reportMissingImports]
+from django.core.cache import cache # pyright: ignore[reportMissingModuleSource]
+from django.test import TestCase, override_settings # pyright: ignore[reportMissingModuleSource]
+from django.urls import reverse # pyright: ignore[reportMissingModuleSource]
+from django.utils import translation # pyright: ignore[reportMissingModuleSource]
+
+from .models import Poll, Candidate, Vote
+
+
+class PollFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Poll
+
+    title = factory.Sequence(lambda n: f"Poll {n}")
+
+
+class CandidateFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Candidate
+
+    poll = factory.SubFactory(PollFactory)
+    name = factory.Sequence(lambda n: f"Candidate {n}")
+
+
+class VoteFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Vote
+
+    poll = factory.SubFactory(PollFactory)
+    voter_fingerprint = factory.LazyFunction(lambda: uuid.uuid4().hex)
+    ranking = factory.LazyFunction(list)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class CachedResultsTests(TestCase):
+    """The results precomputed on Poll follow vote changes."""
+
+    def setUp(self):
+        cache.clear()
+        self.poll = PollFactory()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.a = CandidateFactory(poll=self.poll, name='A')
+            self.b = CandidateFactory(poll=self.poll, name='B')
+
+    def cast(self, *candidates):
+        """Cast a vote ranking the given candidates in order, committing its refresh."""
+        with self.captureOnCommitCallbacks(execute=True):
+            return VoteFactory(poll=self.poll, ranking=[str(c.id) for c in candidates])
+
+    def test_vote_save_refreshes_cached_results(self):
+        self.cast(self.a, self.b)
+        self.cast(self.a, self.b)
+        self.cast(self.b, self.a)
+
+        self.poll.refresh_from_db()
+        self.assertEqual(self.poll.cached_vote_count, 3)
+        self.assertEqual(self.poll.cached_winner_id, str(self.a.id))
+        self.assertEqual(self.poll.cached_stats['first_choice_votes'], {str(self.a.id): 2, str(self.b.id): 1})
+
+    def test_vote_delete_refreshes_cached_results(self):
+        first = self.cast(self.a, self.b)
+        second = self.cast(self.a, self.b)
+        self.cast(self.b, self.a)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+            second.delete()
+
+        self.poll.refresh_from_db()
+        self.assertEqual(self.poll.cached_vote_count, 1)
+        self.assertEqual(self.poll.cached_winner_id, str(self.b.id))
+
+    def test_bulk_vote_delete_queues_one_refresh(self):
+        for _ in range(3):
+            self.cast(self.a, self.b)
+        self.cast(self.b, self.a)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Vote.objects.filter(poll=self.poll, ranking__0=str(self.a.id)).delete()
+
+        self.assertEqual(len(callbacks), 1)
+        self.poll.refresh_from_db()
+        self.assertEqual(self.poll.cached_vote_count, 1)
+        self.assertEqual(self.poll.cached_winner_id, str(self.b.id))
+
+    def test_tiebreaker_change_refreshes_cached_winner(self):
+        self.cast(self.a, self.b)
+        self.cast(self.b, self.a)
+        self.poll.refresh_from_db()
+        self.assertEqual(self.poll.cached_winner_method, 'schulze')
+
+        self.poll.tiebreaker_method = 'borda'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.poll.save()
+
+        self.poll.refresh_from_db()
+        self.assertEqual(self.poll.cached_winner_method, 'borda')
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.poll.save(update_fields=['is_active', 'updated_at'])
+        self.assertEqual(callbacks, [])
+
+    def test_poll_delete_does_not_queue_refreshes(self):
+        self.cast(self.a, self.b)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.poll.delete()
+
+        self.assertEqual(callbacks, [])
+
+    def test_results_poll_recomputes_stale_cache(self):
+        self.cast(self.a, self.b)
+        # Simulate a refresh that never ran (e.g. it failed after commit)
+        VoteFactory(poll=self.poll, ranking=[str(self.b.id), str(self.a.id)])
+        VoteFactory(poll=self.poll, ranking=[str(self.b.id), str(self.a.id)])
+        Poll.objects.filter(pk=self.poll.pk).update(is_active=False)
+
+        response = self.client.get(reverse('voting:results_poll', args=[self.poll.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_votes'], 3)
+        self.assertEqual(response.context['winner'], self.b)
+        self.poll.refresh_from_db()
+        self.assertEqual(self.poll.cached_vote_count, 3)
+
+    def test_creator_dashboard_stores_recomputed_winner(self):
+        self.cast(self.a, self.b)
+        VoteFactory(poll=self.poll, ranking=[str(self.b.id), str(self.a.id)])
+        VoteFactory(poll=self.poll, ranking=[str(self.b.id), str(self.a.id)])
+
+        response = self.client.get(reverse('voting:creator_dashboard', args=[self.poll.creator_code]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['polls_data'][0]['winner'], self.b)
+        self.poll.refresh_from_db()
+        self.assertEqual(self.poll.cached_vote_count, 3)
+        self.assertEqual(self.poll.cached_winner_id, str(self.b.id))
+
+    def test_dashboard_action_keeps_cached_results(self):
+        self.cast(self.a, self.b)
+        self.cast(self.b, self.a)
+        self.cast(self.b, self.a)
+
+        self.client.get(
+            reverse('voting:creator_dashboard', args=[self.poll.creator_code]),
+            {'action': 'close', 'poll_id': self.poll.id},
+        )
+
+        self.poll.refresh_from_db()
+        self.assertFalse(self.poll.is_active)
+        self.assertEqual(self.poll.cached_vote_count, 3)
+        self.assertEqual(self.poll.cached_winner_id, str(self.b.id))
+
+    def test_results_poll_reports_calculation_error(self):
+        Poll.objects.filter(pk=self.poll.pk).update(is_active=False)
+        with mock.patch('voting.models.calculate_condorcet_winner', side_effect=RuntimeError('boom')):
+            self.cast(self.a, self.b)
+
+        response = self.client.get(reverse('voting:results_poll', args=[self.poll.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context['winner'])
+        self.assertIn('Error calculating results.', [str(m) for m in response.context['messages']])
+
+    def test_legacy_poll_results_filled_on_first_read(self):
+        # Polls that predate cached_stats only have a winner and vote count stored
+        Poll.objects.filter(pk=self.poll.pk).update(tiebreaker_method='random', is_active=False)
+        VoteFactory(poll=self.poll, ranking=[str(self.a.id), str(self.b.id)])
+        VoteFactory(poll=self.poll, ranking=[str(self.b.id), str(self.a.id)])
+        Poll.objects.filter(pk=self.poll.pk).update(
+            cached_winner_id=str(self.a.id), cached_winner_method='random', cached_vote_count=2, cached_stats=None,
+        )
+
+        response = self.client.get(reverse('voting:creator_dashboard', args=[self.poll.creator_code]))
+        self.assertTrue(response.context['polls_data'][0]['winner_random'])
+
+        response = self.client.get(reverse('voting:api_results', args=[self.poll.id]))
+        self.assertEqual(response.json()['votes']['total'], 2)
+        self.poll.refresh_from_db()
+        self.assertTrue(self.poll.cached_winner_random)
+        self.assertEqual(self.poll.cached_stats['first_choice_votes'], {str(self.a.id): 1, str(self.b.id): 1})
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class CandidateChangeTests(TestCase):
+    """Editing candidates invalidates what was cached from them."""
+
+    def setUp(self):
+        cache.clear()
+        self.poll = PollFactory(is_active=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.a = CandidateFactory(poll=self.poll, name='A')
+            self.b = CandidateFactory(poll=self.poll, name='B')
+        with self.captureOnCommitCallbacks(execute=True):
+            VoteFactory(poll=self.poll, ranking=[str(self.a.id), str(self.b.id)])
+
+    def test_renamed_candidate_shown_by_api(self):
+        url = reverse('voting:api_results', args=[self.poll.id])
+        self.assertEqual(self.client.get(url).json()['candidates'][str(self.a.id)]['name'], 'A')
+
+        self.a.name = 'Alice'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.a.save()
+
+        self.assertEqual(self.client.get(url).json()['candidates'][str(self.a.id)]['name'], 'Alice')
+
+    def test_deleted_candidate_refreshes_cached_winner(self):
+        self.poll.refresh_from_db()
+        self.assertEqual(self.poll.cached_winner_id, str(self.a.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.a.delete()
+
+        self.poll.refresh_from_db()
+        self.assertEqual(self.poll.cached_winner_id, str(self.b.id))
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class ApiResultsVisibilityTests(TestCase):
+    """poll_api_results only discloses the winner when results_poll would."""
+
+    def setUp(self):
+        cache.clear()
+        self.poll = PollFactory(is_active=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.a = CandidateFactory(poll=self.poll, name='A')
+            self.b = CandidateFactory(poll=self.poll, name='B')
+        with self.captureOnCommitCallbacks(execute=True):
+            VoteFactory(poll=self.poll, ranking=[str(self.a.id), str(self.b.id)])
+        self.url = reverse('voting:api_results', args=[self.poll.id])
+
+    def test_winner_hidden_while_poll_is_active(self):
+        data = self.client.get(self.url).json()
+        self.assertIsNone(data['winner'])
+        self.assertIsNone(data['winner_method'])
+        self.assertEqual(data['votes']['total'], 1)
+
+    def test_etag_after_stale_refresh_matches_next_request(self):
+        # Simulate a refresh that never ran (e.g. it failed after commit)
+        VoteFactory(poll=self.poll, ranking=[str(self.b.id), str(self.a.id)])
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()['votes']['total'], 2)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_winner_shown_to_creator(self):
+        data = self.client.get(self.url, {'creator_code': self.poll.creator_code}).json()
+        self.assertEqual(data['winner'], str(self.a.id))
+
+    def test_winner_shown_once_released_or_closed(self):
+        self.poll.results_released = True
+        self.poll.save(update_fields=['results_released', 'updated_at'])
+        self.assertEqual(self.client.get(self.url).json()['winner'], str(self.a.id))
+
+        self.poll.results_released = False
+        self.poll.is_active = False
+        self.poll.save(update_fields=['results_released', 'is_active', 'updated_at'])
+        self.assertEqual(self.client.get(self.url).json()['winner'], str(self.a.id))
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class DashboardLoginTests(TestCase):
+
+    def test_unknown_or_malformed_code_renders_error(self):
+        for code in ('doesnotexist', 'a/b'):
+            response = self.client.post(reverse('voting:dashboard_login'), {'creator_code': code})
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.context['error'])
+
+    def test_known_code_redirects_to_dashboard(self):
+        poll = PollFactory()
+        response = self.client.post(reverse('voting:dashboard_login'), {'creator_code': poll.creator_code})
+        self.assertRedirects(response, reverse('voting:creator_dashboard', args=[poll.creator_code]))
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class ShareLinkTests(TestCase):
+
+    def test_deleted_poll_returns_404(self):
+        poll = PollFactory()
+        url = reverse('voting:share_link', args=[poll.id])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        poll.delete()
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    @override_settings(SITE_URL='https://vote.example.com')
+    def test_url_uses_site_url(self):
+        poll = PollFactory()
+        data = self.client.get(reverse('voting:share_link', args=[poll.id])).json()
+        self.assertEqual(data['url'], f'https://vote.example.com/vote/{poll.id}/')
+
+    @override_settings(SITE_URL='https://vote.example.com')
+    def test_url_has_no_language_prefix(self):
+        poll = PollFactory()
+        with translation.override('fr'):
+            url = reverse('voting:share_link', args=[poll.id])
+        self.assertTrue(url.startswith('/fr/'))
+        self.assertEqual(self.client.get(url).json()['url'], f'https://vote.example.com/vote/{poll.id}/')
@@ -19,8 +19,8 @@ References:
 - https://en.wikipedia.org/wiki/Schulze_method
 """
 
-from collections import defaultdict
-from typing import List, Dict, Set, Tuple, Optional
+from collections import Counter, defaultdict
+from typing import Iterable, List, Dict, Set, Tuple, Optional
 import logging
 import random
 import urllib.parse
@@ -29,44 +29,51 @@ from django.urls import reverse
 logger = logging.getLogger(__name__)
 
 
-def calculate_condorcet_winner(votes_list: List[List[str]], tiebreaker_method: str = 'schulze', expected_candidates: Set[str] = None) -> Tuple[Optional[str], Optional[str], bool]:
+def calculate_condorcet_winner(votes_list: Iterable[List[str]], tiebreaker_method: str = 'schulze', expected_candidates: Set[str] = None) -> Tuple[Optional[str], Optional[str], bool]:
     """
-    Calculate Condorcet winner from a list of ranked votes.
+    Calculate Condorcet winner from ranked votes.
+    
+    votes_list may be any iterable (e.g. a streamed queryset); it is
+    consumed exactly once and folded into a Counter of distinct ballots,
+    so memory grows with the number of distinct rankings, not of votes.
+    An already folded Counter of ballot tuples is accepted as well.
     
     Returns:
         Tuple (winner_id, method_used, was_randomly_picked)
     """
     
-    if not votes_list:
-        raise ValueError("Cannot calculate winner from empty votes list.")
+    ballots = Counter()
     
     # Filter votes if expected_candidates provided
     if expected_candidates:
-        cleaned_votes = []
-        for vote in votes_list:
+        for vote, weight in _weighted_ballots(votes_list):
             # Keep only candidates that are in expected_candidates, preserving order
-            cleaned_vote = [c for c in vote if c in expected_candidates]
+            cleaned_vote = tuple(c for c in vote if c in expected_candidates)
             if cleaned_vote:
-                cleaned_votes.append(cleaned_vote)
-        votes_list = cleaned_votes
+                ballots[cleaned_vote] += weight
         
-        if not votes_list:
+        if not ballots:
              raise ValueError("No valid votes remaining after filtering candidates.")
 
         # Update all_candidates to be expected_candidates (or intersection)
         all_candidates = expected_candidates
     else:
+        for vote, weight in _weighted_ballots(votes_list):
+            ballots[tuple(vote)] += weight
+        if not ballots:
+            raise ValueError("Cannot calculate winner from empty votes list.")
+        
         # Validate all votes have same length (same candidates)
-        vote_lengths = set(len(vote) for vote in votes_list)
+        vote_lengths = set(len(vote) for vote in ballots)
         if len(vote_lengths) > 1:
             raise ValueError("All votes must have same number of candidates.")
             
         # Get all unique candidates
         all_candidates = set()
-        for vote in votes_list:
+        for vote in ballots:
             all_candidates.update(vote)
     
-    if not votes_list[0]:
+    if not next(iter(ballots)):
         raise ValueError("Votes cannot be empty.")
     
     if len(all_candidates) < 2:
@@ -75,10 +82,11 @@ def calculate_condorcet_winner(votes_list: List[List[str]], tiebreaker_method: s
             return list(all_candidates)[0], 'condorcet', False
         raise ValueError("Need at least 2 candidates.")
     
-    logger.info(f"Calculating winner for {len(votes_list)} votes with {len(all_candidates)} candidates")
+    logger.info(f"Calculating winner for {sum(ballots.values())} votes "
+                f"({len(ballots)} distinct) with {len(all_candidates)} candidates")
     
     # Calculate pairwise results
-    pairwise_results = calculate_pairwise_results(votes_list, all_candidates)
+    pairwise_results = calculate_pairwise_results(ballots, all_candidates)
     
     condorcet_winner = find_condorcet_winner(pairwise_results, all_candidates)
     
@@ -88,7 +96,7 @@ def calculate_condorcet_winner(votes_list: List[List[str]], tiebreaker_method: s
     
     # Tiebreakers
     if tiebreaker_method == 'borda':
-        winner_id, was_random = borda_count_tiebreaker(votes_list)
+        winner_id, was_random = borda_count_tiebreaker(ballots)
         return winner_id, 'borda', was_random
     elif tiebreaker_method == 'random':
         return random_tiebreaker(all_candidates), 'random', True
@@ -97,6 +105,13 @@ def calculate_condorcet_winner(votes_list: List[List[str]], tiebreaker_method: s
         return winner_id, 'schulze', was_random
 
 
+def _weighted_ballots(votes_list):
+    """Yield (ranking, weight) pairs from a Counter of ballots or an iterable of rankings."""
+    if isinstance(votes_list, Counter):
+        return votes_list.items()
+    return ((vote, 1) for vote in votes_list)
+
+
 def calculate_pairwise_results(
     votes_list: List[List[str]], 
     candidates: Set[str]
@@ -107,7 +122,8 @@ def calculate_pairwise_results(
     For each pair of candidates (A, B), count how many voters prefer A over B.
     
     Args:
-        votes_list: List of ranked votes
+        votes_list: List of ranked votes, or a Counter mapping ballot tuples
+            to the number of voters who cast them
         candidates: Set of all candidate IDs
     
     Returns:
@@ -115,17 +131,43 @@ def calculate_pairwise_results(
         Example: {('A', 'B'): 5, ('B', 'A'): 3} means 5 voters prefer A over B
     """
     
-    pairwise = defaultdict(int)
+    # Tally into a matrix indexed by candidate position: counts[i][j] is the
+    # number of voters preferring candidate i over candidate j. This avoids
+    # building and hashing a tuple key for every pair of every vote.
+    index = {}
+    counts = []
     
-    # For each vote
-    for vote in votes_list:
+    # Identical ballots are tallied once and weighted by how often they occur
+    if isinstance(votes_list, Counter):
+        ballots = votes_list
+    else:
+        ballots = Counter(tuple(vote) for vote in votes_list)
+    
+    # For each distinct vote
+    for vote, weight in ballots.items():
+        positions = []
+        for candidate in vote:
+            i = index.get(candidate)
+            if i is None:
+                i = index[candidate] = len(index)
+                for row in counts:
+                    row.append(0)
+                counts.append([0] * len(index))
+            positions.append(i)
+        
         # Compare each pair of candidates in this vote
-        for i, candidate_a in enumerate(vote):
-            for candidate_b in vote[i+1:]:
-                # Voter ranks candidate_a higher than candidate_b
-                pairwise[(candidate_a, candidate_b)] += 1
+        for k, i in enumerate(positions):
+            row = counts[i]
+            for j in positions[k+1:]:
+                # Voters rank candidate i higher than candidate j
+                row[j] += weight
     
-    return dict(pairwise)
+    return {
+        (candidate_a, candidate_b): counts[i][j]
+        for candidate_a, i in index.items()
+        for candidate_b, j in index.items()
+        if counts[i][j]
+    }
 
 
 def find_condorcet_winner(
@@ -232,20 +274,29 @@ def borda_count_tiebreaker(votes_list: List[List[str]]) -> Tuple[str, bool]:
     """
     Simple Borda count as secondary tiebreaker.
     
+    Args:
+        votes_list: List of ranked votes, or a Counter mapping ballot tuples
+            to the number of voters who cast them
+    
     Returns:
         Tuple (winner_id, was_randomly_picked)
     """
     
+    if isinstance(votes_list, Counter):
+        ballots = votes_list
+    else:
+        ballots = Counter(tuple(vote) for vote in votes_list)
+    
     scores = defaultdict(int)
-    n_candidates = len(votes_list[0]) if votes_list else 0
+    n_candidates = len(next(iter(ballots))) if ballots else 0
     
-    for vote in votes_list:
+    for vote, weight in ballots.items():
         for position, candidate in enumerate(vote):
             points = n_candidates - position
-            scores[candidate] += points
+            scores[candidate] += points * weight
     
     if not scores:
-        all_cands = list(set(c for v in votes_list for c in v))
+        all_cands = list(set(c for v in ballots for c in v))
         return random.choice(all_cands), True
 
     max_score = max(scores.values())
@@ -285,12 +336,13 @@ def validate_ranking(ranking: List[str], expected_candidates: Set[str]) -> bool:
     return True
 
 
-def get_ranking_statistics(votes_list: List[List[str]]) -> Dict:
+def get_ranking_statistics(votes_list: Iterable[List[str]]) -> Dict:
     """
     Calculate statistics about voting results.
     
     Args:
-        votes_list: List of ranked votes
+        votes_list: Iterable of ranked votes (consumed once), or a Counter
+            mapping ballot tuples to the number of voters who cast them
     
     Returns:
         Dictionary with statistics:
@@ -302,20 +354,23 @@ def get_ranking_statistics(votes_list: List[List[str]]) -> Dict:
         }
     """
     
-    candidates = set()
-    for vote in votes_list:
-        candidates.update(vote)
+    # Single pass over the votes; everything below works on distinct ballots
+    ballots = Counter()
+    for vote, weight in _weighted_ballots(votes_list):
+        ballots[tuple(vote)] += weight
     
+    candidates = set()
     first_choices = defaultdict(int)
-    for vote in votes_list:
+    for vote, weight in ballots.items():
+        candidates.update(vote)
         if vote:
-            first_choices[vote[0]] += 1
+            first_choices[vote[0]] += weight
     
     return {
-        'total_votes': len(votes_list),
+        'total_votes': sum(ballots.values()),
         'candidates_count': len(candidates),
         'first_choice_votes': dict(first_choices),
-        'pairwise_results': calculate_pairwise_results(votes_list, candidates),
+        'pairwise_results': calculate_pairwise_results(ballots, candidates),
     }
 
 
@@ -19,29 +19,61 @@ Security implemented:
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_protect
+from django.views.decorators.cache import cache_control
+from django.views.decorators.vary import vary_on_headers
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponseForbidden
+from django.http import HttpResponse, JsonResponse, HttpResponseForbidden, HttpResponseNotModified, Http404
 from django.core.exceptions import ValidationError
 from django.db import transaction, IntegrityError
+from django.db.models import Count, Exists, F, OuterRef, Prefetch, Q
 from django.conf import settings
+from django.urls import reverse
+from django.core.cache import cache
 from django.utils.translation import gettext as _
+from django.utils.http import parse_etags
 import json
 import logging
+import orjson
+import segno
 
 from .models import Poll, Candidate, Vote, VoterSession, PollToken
 from .forms import CreatePollForm, VoteForm, AuthForm
 from .utils import (
-    calculate_condorcet_winner, validate_ranking, get_ranking_statistics, calculate_pairwise_results
+    validate_ranking, calculate_pairwise_results
 )
-from django.contrib.auth.hashers import make_password, check_password
+from django.contrib.auth.hashers import check_password
 import secrets
 import hashlib
+import uuid
 from datetime import timedelta
 
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+# QR codes only depend on the vote URL, so they can be cached for long
+QR_CODE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class ORJsonResponse(HttpResponse):
+    """
+    JSON response serialized with orjson (faster than the stdlib encoder
+    used by JsonResponse, and handles UUIDs natively).
+    """
+    
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(orjson.dumps(data), **kwargs)
+
+
+def _form_errors_message(form):
+    """Join all of a form's errors into one message for messages.error()."""
+    return '; '.join(
+        f"{field}: {error}"
+        for field, errors in form.errors.items()
+        for error in errors
+    )
+
 
 @require_http_methods(["GET", "POST"])
 @csrf_protect
@@ -91,29 +123,24 @@ def create_poll(request):
 
                     poll.save()
                     
-                    # Create candidates
+                    # Create candidates (single multi-row INSERT)
                     candidates_list = form.cleaned_data['candidates']
-                    for candidate_name in candidates_list:
-                        Candidate.objects.create(
-                            poll=poll,
-                            name=candidate_name
-                        )
+                    Candidate.objects.bulk_create([
+                        Candidate(poll=poll, name=candidate_name)
+                        for candidate_name in candidates_list
+                    ], batch_size=100)
 
                     # Handle Secure Tokens
                     if poll.requires_auth:
-                        voter_count = form.cleaned_data.get('voter_count', 0)
-                        tokens = []
-                        tokens_objects = []
-                        for _ in range(voter_count):
-                            # Generate a strong 20-char random token (alphanumeric)
-                            token = secrets.token_urlsafe(15) # 15 bytes -> approx 20 chars
-                            tokens.append(token)
-                            
-                            # Hash it for storage
-                            token_hash = make_password(token)
-                            tokens_objects.append(PollToken(poll=poll, token_hash=token_hash))
-                        
-                        PollToken.objects.bulk_create(tokens_objects)
+                        voter_count = form.cleaned_data.get('voter_count') or 0
+                        # Generate strong 20-char random tokens (alphanumeric)
+                        tokens = [secrets.token_urlsafe(15) for _ in range(voter_count)] # 15 bytes -> approx 20 chars
+
+                        # Hash them for storage
+                        PollToken.objects.bulk_create([
+                            PollToken(poll=poll, token_hash=PollToken.hash_token(token))
+                            for token in tokens
+                        ])
                         
                         # Store tokens in session to display ONE TIME on confirmation page
                         request.session['created_tokens'] = tokens
@@ -134,9 +161,7 @@ def create_poll(request):
                              'Error creating poll. Please try again.')
         else:
             # Form validation failed
-            for field, errors in form.errors.items():
-                for error in errors:
-                    messages.error(request, f"{field}: {error}")
+            messages.error(request, _form_errors_message(form))
     
     else:  # GET request
         form = CreatePollForm()
@@ -177,11 +202,16 @@ def index(request):
         Rendered index.html with poll list
     """
     
-    # Get recent public polls (not deleted, is_public=True)
+    # Get recent public polls (not deleted, is_public=True), selecting only the
+    # columns the list displays and counting votes in the same query
     recent_polls = Poll.objects.filter(
         is_active=True,
         is_public=True,
         is_deleted=False
+    ).only(
+        'id', 'title', 'description', 'max_votes', 'created_at'
+    ).annotate(
+        vote_count=Count('vote')
     ).order_by('-created_at')[:10]
     
     context = {
@@ -253,14 +283,22 @@ def vote_poll(request, poll_id):
                 auth_form = AuthForm(request.POST)
                 if auth_form.is_valid():
                     password = auth_form.cleaned_data['password']
-                    # Verify password against unused tokens
-                    # We iterate because we only have hashes
-                    unused_tokens = PollToken.objects.filter(poll=poll, is_used=False)
-                    found_token = None
-                    for t in unused_tokens:
-                        if check_password(password, t.token_hash):
-                            found_token = t
-                            break
+                    # Verify password against unused tokens (indexed lookup on the HMAC)
+                    token_hash = PollToken.hash_token(password)
+                    found_token = PollToken.objects.filter(
+                        poll=poll, token_hash=token_hash, is_used=False
+                    ).first()
+
+                    if not found_token:
+                        # Tokens created before HMAC storage use salted password hashes,
+                        # so we still have to iterate over those
+                        legacy_tokens = PollToken.objects.filter(
+                            poll=poll, is_used=False, token_hash__contains='$'
+                        )
+                        for t in legacy_tokens:
+                            if check_password(password, t.token_hash):
+                                found_token = t
+                                break
                     
                     if found_token:
                         # Success: Store token ID in session
@@ -278,10 +316,10 @@ def vote_poll(request, poll_id):
                 'form': auth_form
             })
     
-    # Get candidates for this poll
-    candidates = poll.get_candidates()
+    # Get candidates for this poll (evaluated once, reused by the form and ranking checks)
+    candidates = list(poll.get_candidates())
     
-    if not candidates.exists():
+    if not candidates:
         messages.error(request, _('Poll has no candidates.'))
         return redirect('index')
     
@@ -307,20 +345,23 @@ def vote_poll(request, poll_id):
             logger.info(f"Vote attempt on poll {poll.id} | IP: {request.voter_ip} | "
                         f"Fingerprint: {device_fingerprint} | Cookie: {cookie_token}")
 
-            # Check if this voter already voted on this poll (by fingerprint)
-            existing_vote_fingerprint = Vote.objects.filter(
-                poll=poll,
-                voter_fingerprint=device_fingerprint
-            ).exists()
-
-            # Check if this voter already voted on this poll (by cookie session)
-            existing_vote_session = False
+            # Check if this voter already voted on this poll, by fingerprint
+            # and by cookie session, in a single query
+            duplicate_checks = {
+                'fingerprint_match': Exists(Vote.objects.filter(
+                    poll=OuterRef('pk'),
+                    voter_fingerprint=device_fingerprint
+                )),
+            }
             if hasattr(request, 'voter_session_token'):
-                existing_vote_session = VoterSession.objects.filter(
-                    poll=poll,
+                duplicate_checks['session_match'] = Exists(VoterSession.objects.filter(
+                    poll=OuterRef('pk'),
                     cookie_token=request.voter_session_token,
                     vote_count__gt=0
-                ).exists()
+                ))
+            matches = Poll.objects.filter(pk=poll.pk).values(**duplicate_checks).get()
+            existing_vote_fingerprint = matches['fingerprint_match']
+            existing_vote_session = matches.get('session_match', False)
             
             if existing_vote_fingerprint or existing_vote_session:
                 logger.warning(f"Duplicate vote blocked: {device_fingerprint} | "
@@ -333,7 +374,6 @@ def vote_poll(request, poll_id):
         else:
             # If multiple votes are allowed, we randomize the fingerprint for the Vote record
             # to bypass the unique_together constraint in the database.
-            import uuid
             vote_fingerprint = Vote.generate_fingerprint(
                 request.voter_ip + str(uuid.uuid4()),
                 request.voter_user_agent
@@ -345,11 +385,7 @@ def vote_poll(request, poll_id):
         
         if form.is_valid():
             # Extract ranking positions to check if we need to show confirmation
-            temp_ranking = [''] * len(candidates)
-            for candidate in candidates:
-                field_name = f'rank_{candidate.id}'
-                rank_position = int(form.cleaned_data[field_name]) - 1
-                temp_ranking[rank_position] = str(candidate.id)
+            temp_ranking = form.get_ranking()
 
             # --- VOTE CONFIRMATION STEP ---
             if 'confirm_vote' not in request.POST:
@@ -380,8 +416,9 @@ def vote_poll(request, poll_id):
                             return redirect('voting:vote_poll', poll_id=poll.id)
                         
                         try:
-                            # Lock the row to prevent race conditions
-                            token_obj = PollToken.objects.select_for_update().get(id=token_id, poll=poll, is_used=False)
+                            # Lock the row to prevent race conditions; a concurrent redeem of the
+                            # same token fails immediately instead of waiting on the lock
+                            token_obj = PollToken.objects.select_for_update(skip_locked=True).get(id=token_id, poll=poll, is_used=False)
                             token_obj.is_used = True
                             token_obj.used_at = timezone.now()
                             token_obj.save()
@@ -398,19 +435,13 @@ def vote_poll(request, poll_id):
                             return redirect('voting:vote_poll', poll_id=poll.id)
 
                     # Build ranking from form data
-                    ranking = [''] * len(candidates)
-                    
-                    for candidate in candidates:
-                        field_name = f'rank_{candidate.id}'
-                        rank_position = int(form.cleaned_data[field_name]) - 1
-                        ranking[rank_position] = str(candidate.id)
+                    ranking = form.get_ranking()
                     
                     # Validate ranking
                     if not validate_ranking(ranking, {str(c.id) for c in candidates}):
                         raise ValidationError("Invalid vote ranking.")
                     
                     # Create vote record
-                    import secrets
                     management_token = secrets.token_hex(16)
                     
                     vote = Vote.objects.create(
@@ -420,10 +451,11 @@ def vote_poll(request, poll_id):
                         management_token=management_token
                     )
                     
-                    # Update voter session
+                    # Update voter session (a new session starts with this vote counted)
                     defaults = {
                         'ip_address': request.voter_ip,
                         'user_agent': request.voter_user_agent,
+                        'vote_count': 1,
                     }
                     if hasattr(request, 'voter_session_token'):
                         defaults['cookie_token'] = request.voter_session_token
@@ -442,14 +474,19 @@ def vote_poll(request, poll_id):
                         if not poll.allow_multiple_votes_per_device and not poll.requires_auth:
                              logger.warning(f"VoterSession existed but Vote didn't? Fingerprint: {device_fingerprint}")
                         
+                        # Single UPDATE with an F() increment instead of fetch-modify-save
+                        updates = {
+                            'vote_count': F('vote_count') + 1,
+                            'last_activity': timezone.now(),
+                        }
                         if hasattr(request, 'voter_session_token') and voter_session.cookie_token != request.voter_session_token:
                              logger.info(f"Updating session token from {voter_session.cookie_token} to {request.voter_session_token}")
+                             updates['cookie_token'] = request.voter_session_token
                              voter_session.cookie_token = request.voter_session_token
                              # Note: This update might fail if new token is already used by another session (IntegrityError)
                              # which is good! It means this cookie already voted.
 
-                    voter_session.vote_count += 1
-                    voter_session.save()
+                        VoterSession.objects.filter(pk=voter_session.pk).update(**updates)
                     
                     logger.info(f"Vote recorded: {vote.id} on poll {poll.id} | "
                                 f"Session Token: {voter_session.cookie_token}")
@@ -469,9 +506,7 @@ def vote_poll(request, poll_id):
                              _('Error recording vote. Please try again.'))
         else:
             # Form validation failed
-            for field, errors in form.errors.items():
-                for error in errors:
-                    messages.error(request, f"{field}: {error}")
+            messages.error(request, _form_errors_message(form))
     
     else:  # GET request
         form = VoteForm(candidates)
@@ -521,95 +556,79 @@ def results_poll(request, poll_id):
         messages.error(request, _('Results are only available after the poll is closed or when released by the creator.'))
         return redirect('voting:index')
     
-    # Get all votes for this poll
-    votes_queryset = Vote.objects.filter(poll=poll).values_list('ranking', flat=True)
-    votes_list = list(votes_queryset)
-    
-    # Count unique voters (based on fingerprint)
-    unique_voters_count = Vote.objects.filter(poll=poll).values('voter_fingerprint').distinct().count()
-    
     # Build candidate lookup
     candidates = list(poll.get_candidates())
     candidate_dict = {str(c.id): c for c in candidates}
     
-    # Calculate results
-    winner_method = None
-    winner_random = False
-    if votes_list:
-        try:
-            # Calculate winner
-            valid_candidate_ids = set(candidate_dict.keys())
-            winner_id, winner_method, winner_random = calculate_condorcet_winner(votes_list, poll.tiebreaker_method, expected_candidates=valid_candidate_ids)
-            winner = candidate_dict.get(winner_id)
-            
-            if winner:
-                logger.info(f"Winner object found: {winner.name} ({winner.id})")
-            else:
-                logger.warning(f"Winner ID {winner_id} returned but not found in candidate_dict keys: {list(candidate_dict.keys())}")
-            
-            # Get statistics
-            stats = get_ranking_statistics(votes_list)
-            
-            # Prepare first choice votes data for template
-            first_choice_data = []
-            for cand_id, count in stats['first_choice_votes'].items():
-                cand = candidate_dict.get(cand_id)
-                if cand:
-                    first_choice_data.append({
-                        'candidate': cand,
-                        'count': count,
-                        'percentage': round(100 * count / len(votes_list), 1) if votes_list else 0
-                    })
-            
-            # Sort by count descending
-            first_choice_data.sort(key=lambda x: x['count'], reverse=True)
-            
-            # Process pairwise results for template
-            raw_pairwise = stats.get('pairwise_results', {})
-            pairwise_list = []
-            processed_pairs = set()
+    # Winner and statistics are precomputed when votes change
+    poll.ensure_cached_results()
+    
+    total_votes = poll.cached_vote_count
+    winner_method = poll.cached_winner_method
+    winner_random = poll.cached_winner_random
+    stats = poll.cached_stats or {}
+    if stats.get('error'):
+        messages.error(request, _('Error calculating results.'))
+    
+    # Count unique voters (based on fingerprint). Votes are unique per
+    # (poll, voter_fingerprint), so this is simply the number of votes.
+    unique_voters_count = total_votes
+    
+    winner = None
+    if poll.cached_winner_id:
+        winner = candidate_dict.get(poll.cached_winner_id)
+        if winner:
+            logger.info(f"Winner object found: {winner.name} ({winner.id})")
+        else:
+            logger.warning(f"Winner ID {poll.cached_winner_id} returned but not found in candidate_dict keys: {list(candidate_dict.keys())}")
+    
+    # Prepare first choice votes data for template
+    first_choice_data = []
+    for cand_id, count in stats.get('first_choice_votes', {}).items():
+        cand = candidate_dict.get(cand_id)
+        if cand:
+            first_choice_data.append({
+                'candidate': cand,
+                'count': count,
+                'percentage': round(100 * count / total_votes, 1) if total_votes else 0
+            })
+    
+    # Sort by count descending
+    first_choice_data.sort(key=lambda x: x['count'], reverse=True)
+    
+    # Process pairwise results for template: walk the upper triangle of the
+    # candidate list so each matchup is visited exactly once
+    raw_pairwise = {
+        (cand_a_id, cand_b_id): votes
+        for cand_a_id, cand_b_id, votes in stats.get('pairwise_results', [])
+    }
+    pairwise_list = []
+    candidate_ids = list(candidate_dict)
+    
+    for i, cand_a_id in enumerate(candidate_ids):
+        cand_a = candidate_dict[cand_a_id]
+        for cand_b_id in candidate_ids[i + 1:]:
+            votes_a = raw_pairwise.get((cand_a_id, cand_b_id), 0)
+            votes_b = raw_pairwise.get((cand_b_id, cand_a_id), 0)
+            # Pairs no voter ranked against each other are not shown
+            if not (votes_a or votes_b):
+                continue
             
-            for (cand_a_id, cand_b_id), votes_a in raw_pairwise.items():
-                # Skip if we already processed this pair (in reverse)
-                pair_key = tuple(sorted([cand_a_id, cand_b_id]))
-                if pair_key in processed_pairs:
-                    continue
-                
-                processed_pairs.add(pair_key)
-                
-                cand_a = candidate_dict.get(cand_a_id)
-                cand_b = candidate_dict.get(cand_b_id)
+            cand_b = candidate_dict[cand_b_id]
+            matchup_winner = None
+            if votes_a > votes_b:
+                matchup_winner = cand_a
+            elif votes_b > votes_a:
+                matchup_winner = cand_b
                 
-                if cand_a and cand_b:
-                    votes_b = raw_pairwise.get((cand_b_id, cand_a_id), 0)
-                    
-                    matchup_winner = None
-                    if votes_a > votes_b:
-                        matchup_winner = cand_a
-                    elif votes_b > votes_a:
-                        matchup_winner = cand_b
-                        
-                    pairwise_list.append({
-                        'candidate_a': cand_a,
-                        'candidate_b': cand_b,
-                        'votes_a': votes_a,
-                        'votes_b': votes_b,
-                        'winner': matchup_winner,
-                        'is_tie': votes_a == votes_b
-                    })
-
-        except Exception as e:
-            logger.error(f"Error calculating results: {str(e)}")
-            winner = None
-            stats = {}
-            first_choice_data = []
-            pairwise_list = []
-            messages.error(request, _('Error calculating results.'))
-    else:
-        winner = None
-        stats = {}
-        first_choice_data = []
-        pairwise_list = []
+            pairwise_list.append({
+                'candidate_a': cand_a,
+                'candidate_b': cand_b,
+                'votes_a': votes_a,
+                'votes_b': votes_b,
+                'winner': matchup_winner,
+                'is_tie': votes_a == votes_b
+            })
 
     # Calculate User's Verification IDs (for Transparency)
     user_verification_ids = []
@@ -627,7 +646,7 @@ def results_poll(request, poll_id):
     context = {
         'poll': poll,
         'winner': winner,
-        'winner_method': winner_method,        'winner_random': winner_random,        'total_votes': len(votes_list),
+        'winner_method': winner_method,        'winner_random': winner_random,        'total_votes': total_votes,
         'unique_voters_count': unique_voters_count,
         'num_candidates': len(candidates),
         'candidates': candidate_dict,
@@ -668,9 +687,14 @@ def poll_confirmation(request, poll_id, creator_code):
     # Build voting URL using SITE_URL from settings
     vote_url = f"{settings.SITE_URL}/vote/{poll.id}/"
     
-    # Generate QR code URL using external service (qr-server)
-    import urllib.parse
-    qr_code_url = f"https://api.qrserver.com/v1/create-qr-code/?size=300x300&data={urllib.parse.quote(vote_url)}"
+    # Render the QR code locally as an inline SVG data URI; it only depends
+    # on the vote URL, so cache it under a hash of that URL (a SITE_URL
+    # change then can't serve a QR code pointing at the old domain)
+    qr_cache_key = f"qr:{hashlib.sha256(vote_url.encode()).hexdigest()}"
+    qr_code_url = cache.get(qr_cache_key)
+    if qr_code_url is None:
+        qr_code_url = segno.make(vote_url, error='m').svg_data_uri(scale=6)
+        cache.set(qr_cache_key, qr_code_url, QR_CODE_CACHE_TIMEOUT)
     
     context = {
         'poll': poll,
@@ -705,10 +729,16 @@ def creator_dashboard(request, creator_code):
         Rendered dashboard with creator's polls
     """
     
-    # Get all polls managed by this creator code
+    # Get all polls managed by this creator code, with vote counts and
+    # candidates loaded up front (avoids per-poll queries in the loop below).
+    # The dashboard only shows candidate names, so fetch just those columns.
     polls = Poll.objects.filter(
         creator_code=creator_code,
         is_deleted=False
+    ).annotate(
+        vote_count=Count('vote')
+    ).prefetch_related(
+        Prefetch('candidate_set', queryset=Candidate.objects.only('id', 'poll', 'name'))
     ).order_by('-created_at')
 
     # Handle actions (make_public, close, delete) early to avoid "no polls" error on redirect
@@ -723,23 +753,23 @@ def creator_dashboard(request, creator_code):
             
             if action == 'make_public':
                 poll.is_public = True
-                poll.save()
+                poll.save(update_fields=['is_public', 'updated_at'])
                 messages.success(request, f'Poll "{poll.title}" is now public!')
                 
             elif action == 'make_private':
                 poll.is_public = False
-                poll.save()
+                poll.save(update_fields=['is_public', 'updated_at'])
                 messages.success(request, f'Poll "{poll.title}" is now private!')
                 
             elif action == 'close':
                 poll.is_active = False
-                poll.save()
+                poll.save(update_fields=['is_active', 'updated_at'])
                 messages.success(request, f'Poll "{poll.title}" closed!')
                 
             elif action == 'reopen':
                 poll.is_active = True
                 poll.closing_date = None
-                poll.save()
+                poll.save(update_fields=['is_active', 'closing_date', 'updated_at'])
                 messages.success(request, _('Poll "%(title)s" reopened!') % {'title': poll.title})
                 
             elif action == 'delete':
@@ -756,12 +786,12 @@ def creator_dashboard(request, creator_code):
                 
             elif action == 'release_results':
                 poll.results_released = True
-                poll.save()
+                poll.save(update_fields=['results_released', 'updated_at'])
                 messages.success(request, _('Results for "%(title)s" released! Voters can now view results.') % {'title': poll.title})
                 
             elif action == 'hide_results':
                 poll.results_released = False
-                poll.save()
+                poll.save(update_fields=['results_released', 'updated_at'])
                 messages.success(request, _('Results for "%(title)s" are now hidden.') % {'title': poll.title})
                 
             return redirect('voting:creator_dashboard', creator_code=creator_code)
@@ -776,7 +806,7 @@ def creator_dashboard(request, creator_code):
     for poll in polls:
         if poll.is_active and poll.closing_date and timezone.now() > poll.closing_date:
             poll.is_active = False
-            poll.save()
+            poll.save(update_fields=['is_active', 'updated_at'])
     
     if not polls.exists():
         messages.error(request, _('No polls found for this creator code.'))
@@ -785,29 +815,23 @@ def creator_dashboard(request, creator_code):
     # Build rich context for each poll
     polls_data = []
     for poll in polls:
-        vote_count = poll.get_vote_count()
+        vote_count = poll.vote_count
+        # Prefetched candidates (already ordered by name via Candidate.Meta)
+        candidates = list(poll.candidate_set.all())
+        candidate_dict = {str(c.id): c for c in candidates}
         
-        # Calculate winner if votes exist
-        winner = None
-        winner_random = False
-        if vote_count > 0:
-            votes_queryset = Vote.objects.filter(poll=poll).values_list('ranking', flat=True)
-            votes_list = list(votes_queryset)
-            try:
-                valid_candidate_ids = set(str(c.id) for c in poll.candidate_set.all())
-                winner_id, method, was_random = calculate_condorcet_winner(votes_list, poll.tiebreaker_method, expected_candidates=valid_candidate_ids)
-                winner = poll.candidate_set.get(id=winner_id) if winner_id else None
-                winner_random = was_random
-            except Exception:
-                winner_random = False
+        # The winner is precomputed when votes change
+        poll.ensure_cached_results(vote_count)
+        winner = candidate_dict.get(poll.cached_winner_id) if vote_count else None
+        winner_random = poll.cached_winner_random if winner else False
         
         polls_data.append({
             'poll': poll,
             'vote_count': vote_count,
             'winner': winner,
             'winner_random': winner_random,
-            'candidates_count': poll.candidate_set.count(),
-            'candidates': poll.get_candidates(),
+            'candidates_count': len(candidates),
+            'candidates': candidates,
         })
     
     context = {
@@ -837,18 +861,23 @@ def poll_share_link(request, poll_id):
         JSON: {'url': 'https://example.com/vote/poll_id/'}
     """
     
-    poll = get_object_or_404(Poll, id=poll_id)
+    # Only the poll's existence is needed, so check that instead of fetching the row
+    if not Poll.objects.filter(id=poll_id).exists():
+        raise Http404("Poll not found.")
     
-    # Build full URL using SITE_URL from settings
-    share_url = f"{settings.SITE_URL}/vote/{poll.id}/"
+    # Build full URL from SITE_URL the same way as the rest of the app's shared
+    # links: without a language prefix, so recipients get their own language
+    share_url = f"{settings.SITE_URL}/vote/{poll_id}/"
     
-    return JsonResponse({
+    return ORJsonResponse({
         'url': share_url,
-        'poll_id': str(poll.id),
+        'poll_id': poll_id,
     })
 
 
 @require_http_methods(["GET"])
+@cache_control(public=True, max_age=5)
+@vary_on_headers('Accept-Encoding')
 def poll_api_results(request, poll_id):
     """
     API endpoint for poll results (JSON).
@@ -866,42 +895,71 @@ def poll_api_results(request, poll_id):
         - Condorcet winner (if available)
     """
     
-    poll = get_object_or_404(Poll, id=poll_id)
-    
-    votes_queryset = Vote.objects.filter(poll=poll).values_list('ranking', flat=True)
-    votes_list = list(votes_queryset)
-    
-    # Calculate results
-    winner_id = None
-    winner_method = None
-    if votes_list:
-        try:
-            valid_candidate_ids = set(str(c.id) for c in poll.get_candidates())
-            winner_id, winner_method = calculate_condorcet_winner(votes_list, poll.tiebreaker_method, expected_candidates=valid_candidate_ids)
-        except Exception as e:
-            logger.error(f"Error calculating winner: {str(e)}")
+    # Only select the columns this endpoint returns, plus what
+    # Poll.ensure_cached_results needs to tell whether the winner is current
+    poll = get_object_or_404(
+        Poll.objects.only(
+            'id', 'title', 'description', 'is_active', 'max_votes', 'updated_at',
+            'creator_code', 'results_released',
+            'cached_winner_id', 'cached_winner_method', 'cached_vote_count',
+        ).annotate(
+            vote_count=Count('vote'),
+            has_cached_stats=Q(cached_stats__isnull=False),
+        ),
+        id=poll_id
+    )
+    
+    # Winner and vote count are precomputed when votes change
+    poll.ensure_cached_results(poll.vote_count, poll.has_cached_stats)
+    total_votes = poll.cached_vote_count
+    
+    # Same visibility rule as results_poll: the winner is only disclosed once the
+    # poll is closed, the creator has released results, or to the creator
+    creator_code = request.GET.get('creator_code')
+    is_creator = bool(creator_code) and creator_code == poll.creator_code
+    show_winner = not poll.is_active or poll.results_released or is_creator
+    
+    # Live-update clients poll this endpoint; answer 304 while nothing has changed.
+    # updated_at is bumped by poll edits and every winner refresh.
+    etag = f'W/"{poll.id}-{total_votes}-{poll.updated_at.timestamp()}-{int(show_winner)}"'
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match and etag in parse_etags(if_none_match):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+    
+    # Candidates rarely change after poll creation, so keep their (id, name) pairs
+    # cached; voting.signals drops the entry when a candidate is edited or removed
+    cands_cache_key = f"cands:{poll.id}"
+    cands = cache.get(cands_cache_key)
+    if cands is None:
+        # values_list skips model instantiation; only id and name are needed
+        cands = [(str(cid), name) for cid, name in poll.get_candidates().values_list('id', 'name')]
+        cache.set(cands_cache_key, cands, 3600)
     
     # Get candidates
     candidates_dict = {
-        str(c.id): {'id': str(c.id), 'name': c.name}
-        for c in poll.get_candidates()
+        cid: {'id': cid, 'name': name}
+        for cid, name in cands
     }
     
-    return JsonResponse({
+    response = ORJsonResponse({
         'poll': {
-            'id': str(poll.id),
+            'id': poll.id,
             'title': poll.title,
             'description': poll.description,
             'is_active': poll.is_active,
         },
         'votes': {
-            'total': len(votes_list),
+            'total': total_votes,
             'max': poll.max_votes,
         },
         'candidates': candidates_dict,
-        'winner': winner_id,
-        'winner_method': winner_method,
+        'winner': poll.cached_winner_id if show_winner else None,
+        'winner_method': poll.cached_winner_method if show_winner else None,
     })
+    response['ETag'] = etag
+    return response
 
 
 @require_http_methods(["GET", "POST"])
@@ -909,7 +967,12 @@ def poll_api_results(request, poll_id):
 def dashboard_login(request):
     """
     Allow creators or voters to access their content by entering a code/token.
+    
+    Errors are passed through the template context rather than the messages
+    framework, so failed attempts don't cause a session write.
     """
+    error = None
+    
     if request.method == 'POST':
         form_type = request.POST.get('type')
         
@@ -923,21 +986,23 @@ def dashboard_login(request):
                 vote = Vote.objects.get(management_token=vote_token)
                 return redirect('voting:manage_vote', token=vote_token)
             except Vote.DoesNotExist:
-                messages.error(request, _('The provided link or token is invalid.'))
-            return render(request, 'voting/dashboard_login.html')
+                error = _('The provided link or token is invalid.')
+            return render(request, 'voting/dashboard_login.html', {'error': error})
 
         # Creator dashboard
         creator_code = request.POST.get('creator_code')
         if creator_code:
-            # Check if any poll exists with this code
+            # Check if any poll exists with this code. This also keeps arbitrary
+            # input out of redirect()/reverse() and reports a wrong code through
+            # the context instead of a session-backed message.
             if Poll.objects.filter(creator_code=creator_code, is_deleted=False).exists():
                 return redirect('voting:creator_dashboard', creator_code=creator_code)
             else:
-                messages.error(request, _('Invalid creator code. No polls found.'))
+                error = _('Invalid creator code. No polls found.')
         else:
-            messages.error(request, _('Please enter a creator code.'))
+            error = _('Please enter a creator code.')
             
-    return render(request, 'voting/dashboard_login.html')
+    return render(request, 'voting/dashboard_login.html', {'error': error})
 
 def download_results_json(request, poll_id):
     """
@@ -1047,11 +1112,7 @@ def manage_vote(request, token):
         if form.is_valid():
             try:
                 # Build NEW ranking
-                new_ranking = [''] * len(candidates)
-                for candidate in candidates:
-                    field_name = f'rank_{candidate.id}'
-                    rank_position = int(form.cleaned_data[field_name]) - 1
-                    new_ranking[rank_position] = str(candidate.id)
+                new_ranking = form.get_ranking()
                 
                 # Validate
                 if not validate_ranking(new_ranking, {str(c.id) for c in candidates}):
@@ -1068,9 +1129,7 @@ def manage_vote(request, token):
                 logger.error(f"Error updating vote: {str(e)}")
                 messages.error(request, _('Error updating vote.'))
         else:
-            for field, errors in form.errors.items():
-                for error in errors:
-                    messages.error(request, f"{field}: {error}")
+            messages.error(request, _form_errors_message(form))
     else:
         # Pre-fill form with current ranking positions
         initial_data = {}